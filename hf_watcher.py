@@ -1,21 +1,87 @@
 #!/usr/bin/env python3
 """Harbor Freight price watcher - sends email alerts when prices drop below thresholds."""
 
-import json
+import asyncio
+import codecs
 import os
+import random
 import re
 import smtplib
+import ssl
 import sys
-from datetime import datetime
+import time
+from collections.abc import Awaitable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from email.utils import parsedate_to_datetime
 from pathlib import Path
+from urllib.parse import urlsplit
 
-from curl_cffi import requests
+import orjson
+from curl_cffi.requests import AsyncSession
+from curl_cffi.requests.exceptions import RequestException
+from selectolax.lexbor import LexborHTMLParser
 
 WATCHLIST_FILE = Path(__file__).parent / "watchlist.json"
 STATE_FILE = Path(__file__).parent / "last_state.json"
 
+# Maximum number of product pages fetched at the same time
+MAX_CONCURRENCY = 8
+# ...and from any single host, to stay polite and avoid tripping bot protection
+PER_HOST_CONCURRENCY = 2
+REQUEST_TIMEOUT = 30
+
+# Transient failures are retried with decorrelated-jitter backoff (seconds)
+MAX_RETRIES = 3
+RETRY_DELAY_BASE = 2
+RETRY_DELAY_CAP = 30
+RETRY_STATUSES = {403, 429, 500, 502, 503, 504}
+
+# Per-host request rate (req/s), adapted to the server's throttling as we go
+INITIAL_HOST_RATE = 2.0
+MIN_HOST_RATE = 0.1
+MAX_HOST_RATE = 4.0
+HOST_RATE_STEP = 0.1
+HOST_RATE_STEP_AFTER = 20  # consecutive successes before speeding up
+THROTTLE_STATUSES = {429, 503}
+
+SKU_RE = re.compile(r"-(\d+)\.html$")
+JSONLD_OPEN = '<script type="application/ld+json">'
+SCRIPT_CLOSE = "</script>"
+OG_PRICE_SELECTOR = 'meta[property="og:price:amount"], meta[name="og:price:amount"]'
+OG_TITLE_SELECTOR = 'meta[property="og:title"], meta[name="og:title"]'
+
+# Static parts of the alert email, so only the item rows are built per send
+EMAIL_CELL = '<td style="padding:12px;border-bottom:1px solid #ddd;">'
+EMAIL_PRICE_CELL = '<td style="padding:12px;border-bottom:1px solid #ddd;color:#16a34a;font-weight:bold;">'
+EMAIL_HTML_HEAD = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"></head>
+<body style="font-family:system-ui,sans-serif;max-width:800px;margin:0 auto;padding:20px;">
+    <h2 style="color:#dc2626;">Harbor Freight Price Alert!</h2>
+    <p>The following item(s) have dropped to or below your target price:</p>
+    <table style="border-collapse:collapse;width:100%;margin:20px 0;">
+        <thead>
+            <tr style="background:#f3f4f6;">
+                <th style="padding:12px;text-align:left;border-bottom:2px solid #ddd;">Item</th>
+                <th style="padding:12px;text-align:left;border-bottom:2px solid #ddd;">Current Price</th>
+                <th style="padding:12px;text-align:left;border-bottom:2px solid #ddd;">Your Threshold</th>
+                <th style="padding:12px;text-align:left;border-bottom:2px solid #ddd;">Previous Price</th>
+                <th style="padding:12px;text-align:left;border-bottom:2px solid #ddd;">Action</th>
+            </tr>
+        </thead>
+        <tbody>"""
+EMAIL_HTML_TAIL = """
+        </tbody>
+    </table>
+    <p style="color:#666;font-size:14px;">
+        Prices may change - act fast!
+    </p>
+</body>
+</html>"""
+
 
 def get_config():
     """Load configuration from environment variables."""
@@ -31,171 +97,386 @@ def load_watchlist() -> list[dict]:
     if not WATCHLIST_FILE.exists():
         print(f"Error: {WATCHLIST_FILE} not found")
         sys.exit(1)
-    with open(WATCHLIST_FILE) as f:
-        data = json.load(f)
+    with open(WATCHLIST_FILE, "rb") as f:
+        data = orjson.loads(f.read())
     return data.get("items", [])
 
 
 def load_previous_state() -> dict:
     """Load previous price state."""
     if STATE_FILE.exists():
-        with open(STATE_FILE) as f:
-            return json.load(f)
+        with open(STATE_FILE, "rb") as f:
+            return orjson.loads(f.read())
     return {}
 
 
 def save_state(state: dict):
     """Save current price state."""
     state["updated_at"] = datetime.now().isoformat()
-    with open(STATE_FILE, "w") as f:
-        json.dump(state, f, indent=2)
+    # Write to a sibling file and swap it in, so a crash mid-write can't corrupt state
+    tmp_file = STATE_FILE.with_suffix(".json.tmp")
+    with open(tmp_file, "wb") as f:
+        f.write(orjson.dumps(state))
+    os.replace(tmp_file, STATE_FILE)
 
 
 def extract_sku_from_url(url: str) -> str | None:
     """Extract SKU from Harbor Freight URL."""
-    match = re.search(r"-(\d+)\.html$", url)
+    match = SKU_RE.search(url)
     return match.group(1) if match else None
 
 
+def product_from_jsonld(data: dict) -> dict | None:
+    """Extract product info from JSON-LD Product data, or None if its price is unusable."""
+    offers = data.get("offers", {})
+    try:
+        return {
+            "name": data.get("name"),
+            "sku": data.get("sku"),
+            "price": float(offers.get("price", 0)),
+            "availability": offers.get("availability", ""),
+        }
+    except ValueError:
+        return None
+
+
+def find_jsonld_product(html: str, start: int = 0) -> tuple[dict | None, int]:
+    """Scan JSON-LD script blocks from start for a Product with a usable price.
+
+    Returns its product info (or None) and the offset a later scan of the same,
+    growing, text can resume from without missing a block that was cut off.
+    """
+    idx = start
+    while (idx := html.find(JSONLD_OPEN, idx)) >= 0:
+        body_start = idx + len(JSONLD_OPEN)
+        body_end = html.find(SCRIPT_CLOSE, body_start)
+        if body_end < 0:
+            return None, idx  # Block hasn't fully arrived yet
+        try:
+            data = orjson.loads(html[body_start:body_end])
+        except orjson.JSONDecodeError:
+            data = None
+        if isinstance(data, dict) and data.get("@type") == "Product":
+            product = product_from_jsonld(data)
+            if product:
+                return product, idx
+        start = idx = body_end + len(SCRIPT_CLOSE)
+    # The opening tag itself may be split across the end of the text
+    return None, max(start, len(html) - len(JSONLD_OPEN) + 1)
+
+
 def parse_price_from_html(html: str, url: str) -> dict:
     """Parse product info from HTML response."""
     if "PerimeterX" in html or "px-captcha" in html:
         return {"error": "Blocked by bot protection"}
 
-    # Extract JSON-LD Product data
-    pattern = r'<script type="application/ld\+json">\s*(\{[^<]*"@type"\s*:\s*"Product"[^<]*\})\s*</script>'
-    matches = re.findall(pattern, html, re.DOTALL)
-
-    for match in matches:
-        try:
-            data = json.loads(match)
-            if data.get("@type") == "Product":
-                offers = data.get("offers", {})
-                return {
-                    "name": data.get("name"),
-                    "sku": data.get("sku"),
-                    "price": float(offers.get("price", 0)),
-                    "availability": offers.get("availability", ""),
-                }
-        except (json.JSONDecodeError, ValueError):
-            continue
+    # Extract JSON-LD Product data, skipping blocks with a bad price
+    product, _ = find_jsonld_product(html)
+    if product:
+        return product
 
     # Fallback: try og:price:amount meta tag
-    og_price = re.search(r'og:price:amount"\s+content="([^"]+)"', html)
-    og_name = re.search(r'og:title"\s+content="([^"]+)"', html)
-    if og_price:
+    tree = LexborHTMLParser(html)
+    og_price = tree.css_first(OG_PRICE_SELECTOR)
+    og_name = tree.css_first(OG_TITLE_SELECTOR)
+    if og_price and og_price.attributes.get("content"):
         return {
-            "name": og_name.group(1) if og_name else "Unknown",
+            "name": (og_name and og_name.attributes.get("content")) or "Unknown",
             "sku": extract_sku_from_url(url),
-            "price": float(og_price.group(1)),
+            "price": float(og_price.attributes["content"]),
             "availability": "unknown",
         }
 
     return {"error": "Could not parse price from page"}
 
 
-def fetch_price(url: str) -> dict:
-    """Fetch product info from Harbor Freight."""
+async def read_product_page(response) -> str:
+    """Read a streamed page body, stopping early once the JSON-LD Product block has arrived."""
+    decoder = codecs.getincrementaldecoder(response.encoding)(errors="replace")
+    html = ""
+    scan_from = 0
+
+    async for chunk in response.aiter_content():
+        html += decoder.decode(chunk)
+        product, scan_from = find_jsonld_product(html, scan_from)
+        if product:
+            return html
+
+    return html + decoder.decode(b"", final=True)
+
+
+@dataclass
+class _TokenBucket:
+    """Paces requests to one host, halving the rate when throttled and creeping back up (AIMD)."""
+
+    rate: float = INITIAL_HOST_RATE
+    burst: float = PER_HOST_CONCURRENCY
+    tokens: float = PER_HOST_CONCURRENCY
+    last_refill: float = field(default_factory=time.monotonic)
+    successes: int = 0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    async def acquire(self):
+        """Wait until a request may be sent."""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate)
+                self.last_refill = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def record(self, response):
+        """Adjust the rate based on a response's status and rate-limit headers."""
+        throttled = (
+            response.status_code in THROTTLE_STATUSES
+            or response.headers.get("X-RateLimit-Remaining") == "0"
+        )
+        if throttled:
+            self.rate = max(MIN_HOST_RATE, self.rate / 2)
+            self.successes = 0
+        elif response.status_code < 400:
+            self.successes += 1
+            if self.successes >= HOST_RATE_STEP_AFTER:
+                self.rate = min(MAX_HOST_RATE, self.rate + HOST_RATE_STEP)
+                self.successes = 0
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header (seconds or an HTTP date) into a delay in seconds."""
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+async def fetch_price(session: AsyncSession, bucket: _TokenBucket, url: str, cached: dict | None = None) -> dict:
+    """Fetch product info from Harbor Freight.
+
+    If a cached state entry is given, the request is made conditional on its ETag /
+    Last-Modified, and the cached info is returned when the page hasn't changed.
+    """
+    cached = cached or {}
+    headers = {}
+    if cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+
+    delay = RETRY_DELAY_BASE
+    for attempt in range(MAX_RETRIES):
+        if attempt:
+            await asyncio.sleep(delay)
+        try:
+            await bucket.acquire()
+            response = await session.get(url, headers=headers, stream=True)
+            bucket.record(response)
+            try:
+                status = response.status_code
+                if status == 304:
+                    html = None
+                    break
+                if status < 400:
+                    html = await read_product_page(response)
+                    break
+                if status not in RETRY_STATUSES:
+                    return {"error": f"HTTP Error {status}"}
+                error = f"HTTP Error {status}"
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            finally:
+                # Stop the transfer if we bailed out before the end of the page
+                response.quit_now.set()
+                await response.aclose()
+        except RequestException as e:
+            error, retry_after = str(e), None
+        except Exception as e:
+            return {"error": str(e)}
+
+        # Honor the server's Retry-After, otherwise back off with decorrelated jitter
+        if retry_after is None:
+            delay = min(RETRY_DELAY_CAP, random.uniform(RETRY_DELAY_BASE, delay * 3))
+        elif retry_after > RETRY_DELAY_CAP:
+            # Retrying any sooner would just be refused again; leave it for the next run
+            return {"error": f"{error} (Retry-After {retry_after:.0f}s)"}
+        else:
+            delay = retry_after
+    else:
+        return {"error": error}
+
+    # Parse outside the retry loop - a page that fails to parse won't parse on a retry
     try:
-        # Use curl_cffi with Chrome impersonation to bypass bot detection
-        response = requests.get(url, impersonate="chrome", timeout=30)
-        response.raise_for_status()
-        return parse_price_from_html(response.text, url)
+        if html is None:
+            result = {
+                "name": cached.get("name"),
+                "sku": extract_sku_from_url(url),
+                "price": cached["price"],
+                "availability": cached.get("availability", ""),
+            }
+        else:
+            result = parse_price_from_html(html, url)
     except Exception as e:
         return {"error": str(e)}
 
+    if "error" not in result:
+        result["etag"] = response.headers.get("ETag") or cached.get("etag")
+        result["last_modified"] = response.headers.get("Last-Modified") or cached.get("last_modified")
+    return result
 
-def check_prices(items: list[dict], previous_state: dict) -> tuple[list[dict], dict]:
-    """Check prices for all items, return alerts and new state."""
-    alerts = []
-    new_state = {"prices": {}}
 
-    for item in items:
-        url = item["url"]
-        threshold = item.get("threshold")
-        name = item.get("name", "Unknown Item")
-        sku = extract_sku_from_url(url) or "unknown"
+def record_result(item: dict, result: dict, previous_prices: dict) -> tuple[str, dict | None, dict | None]:
+    """Log one item's fetch result, return its SKU, new state entry and alert (if any)."""
+    url = item["url"]
+    threshold = item.get("threshold")
+    name = item.get("name", "Unknown Item")
+    sku = extract_sku_from_url(url) or "unknown"
 
-        print(f"Checking: {name} (SKU: {sku})")
+    print(f"Checking: {name} (SKU: {sku})")
 
-        result = fetch_price(url)
+    if "error" in result:
+        print(f"  Error: {result['error']}")
+        # Keep previous price in state if fetch failed
+        return sku, previous_prices.get(sku), None
 
-        if "error" in result:
-            print(f"  Error: {result['error']}")
-            # Keep previous price in state if fetch failed
-            if sku in previous_state.get("prices", {}):
-                new_state["prices"][sku] = previous_state["prices"][sku]
-            continue
+    current_price = result["price"]
+    previous_price = previous_prices.get(sku, {}).get("price")
 
-        current_price = result["price"]
-        previous_price = previous_state.get("prices", {}).get(sku, {}).get("price")
+    print(f"  Price: ${current_price:.2f} (threshold: ${threshold:.2f})")
 
-        print(f"  Price: ${current_price:.2f} (threshold: ${threshold:.2f})")
+    entry = {
+        "price": current_price,
+        "name": result["name"],
+        "availability": result["availability"],
+        "url": url,
+        "last_checked": datetime.now().isoformat(),
+        "etag": result["etag"],
+        "last_modified": result["last_modified"],
+    }
 
-        new_state["prices"][sku] = {
-            "price": current_price,
-            "name": result["name"],
-            "url": url,
-            "last_checked": datetime.now().isoformat(),
-        }
+    # Alert if price is at or below threshold
+    if threshold and current_price <= threshold:
+        # Only alert if this is a new drop (wasn't already below threshold)
+        was_below = previous_price is not None and previous_price <= threshold
+        if not was_below:
+            print(f"  ALERT: Price ${current_price:.2f} is at or below threshold ${threshold:.2f}!")
+            return sku, entry, {
+                "name": result["name"] or name,
+                "sku": sku,
+                "price": current_price,
+                "threshold": threshold,
+                "previous_price": previous_price,
+                "url": url,
+            }
+
+    return sku, entry, None
+
+
+async def check_prices_async(items: list[dict], previous_state: Awaitable[dict]) -> tuple[list[dict], dict]:
+    """Check prices for all items (previous state may still be loading), return alerts and new state."""
+    # Awaited by several workers, and only once they need it
+    previous_state = asyncio.ensure_future(previous_state)
+    alerts = []
+    new_state = {"prices": {}}
 
-        # Alert if price is at or below threshold
-        if threshold and current_price <= threshold:
-            # Only alert if this is a new drop (wasn't already below threshold)
-            was_below = previous_price is not None and previous_price <= threshold
-            if not was_below:
-                alerts.append({
-                    "name": result["name"] or name,
-                    "sku": sku,
-                    "price": current_price,
-                    "threshold": threshold,
-                    "previous_price": previous_price,
-                    "url": url,
-                })
-                print(f"  ALERT: Price ${current_price:.2f} is at or below threshold ${threshold:.2f}!")
+    # Each host gets its own queue, workers and pacing, so distinct hosts overlap
+    todo: dict[str, asyncio.Queue[tuple[int, dict]]] = {}
+    for index, item in enumerate(items):
+        todo.setdefault(urlsplit(item["url"]).netloc, asyncio.Queue()).put_nowait((index, item))
+    results: asyncio.Queue[tuple[int, dict, dict] | None] = asyncio.Queue()
+
+    fetched: dict[str, asyncio.Task[dict]] = {}
+
+    # One session for the whole run so connections (and TLS sessions) to the same
+    # host are kept alive and reused. Use curl_cffi with Chrome impersonation to
+    # bypass bot detection. Its pool of max_clients handles also caps the number of
+    # requests in flight across all hosts.
+    async with AsyncSession(impersonate="chrome", timeout=REQUEST_TIMEOUT, max_clients=MAX_CONCURRENCY) as session:
+        async def fetch_one(bucket: _TokenBucket, url: str) -> dict:
+            # Cached validators are needed for the conditional request. Only trust an entry
+            # saved for this exact URL - SKU-less URLs all share the "unknown" key
+            cached = (await previous_state).get("prices", {}).get(extract_sku_from_url(url) or "unknown")
+            if cached and cached.get("url") != url:
+                cached = None
+            return await fetch_price(session, bucket, url, cached)
+
+        def fetch_once(bucket: _TokenBucket, url: str) -> asyncio.Task[dict]:
+            # Watchlist entries for the same URL (e.g. several thresholds) share one request;
+            # as a Task, a failure reaches every entry waiting on it
+            if url not in fetched:
+                fetched[url] = asyncio.create_task(fetch_one(bucket, url))
+            return fetched[url]
+
+        async def host_worker(queue: asyncio.Queue[tuple[int, dict]], bucket: _TokenBucket):
+            while not queue.empty():
+                index, item = queue.get_nowait()
+                await results.put((index, item, await fetch_once(bucket, item["url"])))
+
+        # The single consumer of results, and the only code touching alerts / new state
+        async def writer():
+            previous_prices = (await previous_state).get("prices", {})
+            recorded = [None] * len(items)
+            while (done := await results.get()) is not None:
+                index, item, result = done
+                recorded[index] = record_result(item, result, previous_prices)
+
+            # Fill in watchlist order, so the email rows and the saved state file
+            # don't reshuffle with fetch timing
+            for sku, entry, alert in recorded:
+                if entry is not None:
+                    new_state["prices"][sku] = entry
+                if alert is not None:
+                    alerts.append(alert)
+
+        workers = []
+        for queue in todo.values():
+            bucket = _TokenBucket()
+            workers += [host_worker(queue, bucket) for _ in range(min(PER_HOST_CONCURRENCY, queue.qsize()))]
+
+        writer_task = asyncio.create_task(writer())
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            writer_task.cancel()
+            await asyncio.gather(writer_task, return_exceptions=True)
+            raise
+        await results.put(None)
+        await writer_task
 
     return alerts, new_state
 
 
 def format_email_html(alerts: list[dict]) -> str:
     """Generate HTML email body."""
-    rows = "\n".join(
-        f"""<tr>
-            <td style="padding:12px;border-bottom:1px solid #ddd;">{a['name']}</td>
-            <td style="padding:12px;border-bottom:1px solid #ddd;color:#16a34a;font-weight:bold;">${a['price']:.2f}</td>
-            <td style="padding:12px;border-bottom:1px solid #ddd;">${a['threshold']:.2f}</td>
-            <td style="padding:12px;border-bottom:1px solid #ddd;">
-                {"${:.2f}".format(a['previous_price']) if a['previous_price'] else "N/A"}
-            </td>
-            <td style="padding:12px;border-bottom:1px solid #ddd;">
-                <a href="{a['url']}" style="color:#dc2626;font-weight:bold;">Buy Now</a>
-            </td>
-        </tr>"""
-        for a in alerts
-    )
-    return f"""<!DOCTYPE html>
-<html>
-<head><meta charset="utf-8"></head>
-<body style="font-family:system-ui,sans-serif;max-width:800px;margin:0 auto;padding:20px;">
-    <h2 style="color:#dc2626;">Harbor Freight Price Alert!</h2>
-    <p>The following item(s) have dropped to or below your target price:</p>
-    <table style="border-collapse:collapse;width:100%;margin:20px 0;">
-        <thead>
-            <tr style="background:#f3f4f6;">
-                <th style="padding:12px;text-align:left;border-bottom:2px solid #ddd;">Item</th>
-                <th style="padding:12px;text-align:left;border-bottom:2px solid #ddd;">Current Price</th>
-                <th style="padding:12px;text-align:left;border-bottom:2px solid #ddd;">Your Threshold</th>
-                <th style="padding:12px;text-align:left;border-bottom:2px solid #ddd;">Previous Price</th>
-                <th style="padding:12px;text-align:left;border-bottom:2px solid #ddd;">Action</th>
-            </tr>
-        </thead>
-        <tbody>{rows}</tbody>
-    </table>
-    <p style="color:#666;font-size:14px;">
-        Prices may change - act fast!
-    </p>
-</body>
-</html>"""
+    parts = [EMAIL_HTML_HEAD]
+    append = parts.append
+    for a in alerts:
+        previous = "${:.2f}".format(a["previous_price"]) if a["previous_price"] else "N/A"
+        append("\n        <tr>")
+        append(EMAIL_CELL)
+        append(str(a["name"]))
+        append("</td>")
+        append(EMAIL_PRICE_CELL)
+        append(f"${a['price']:.2f}")
+        append("</td>")
+        append(EMAIL_CELL)
+        append(f"${a['threshold']:.2f}")
+        append("</td>")
+        append(EMAIL_CELL)
+        append(previous)
+        append("</td>")
+        append(EMAIL_CELL)
+        append('<a href="')
+        append(str(a["url"]))
+        append('" style="color:#dc2626;font-weight:bold;">Buy Now</a></td>')
+        append("</tr>")
+    append(EMAIL_HTML_TAIL)
+    return "".join(parts)
 
 
 def format_email_text(alerts: list[dict]) -> str:
@@ -219,13 +500,16 @@ def send_email(recipients: list[str], alerts: list[dict], smtp_user: str, smtp_p
     msg.attach(MIMEText(format_email_text(alerts), "plain"))
     msg.attach(MIMEText(format_email_html(alerts), "html"))
 
-    with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
+    with smtplib.SMTP_SSL("smtp.gmail.com", 465, context=ssl.create_default_context()) as server:
         server.login(smtp_user, smtp_pass.replace("\xa0", " "))
-        server.sendmail(smtp_user, recipients, msg.as_string())
+        server.send_message(msg, smtp_user, recipients)
     print(f"Email sent to {', '.join(recipients)}")
 
 
-def main():
+async def main_async():
+    # State file IO runs in a thread, and loading starts right away so it overlaps
+    # the watchlist load and session startup
+    previous_state = asyncio.create_task(asyncio.to_thread(load_previous_state))
     config = get_config()
 
     if not config["emails"]:
@@ -239,11 +523,10 @@ def main():
         print("No items in watchlist")
         return
 
-    previous_state = load_previous_state()
-    alerts, new_state = check_prices(items, previous_state)
+    alerts, new_state = await check_prices_async(items, previous_state)
 
     # Always save state
-    save_state(new_state)
+    await asyncio.to_thread(save_state, new_state)
     print("State saved.")
 
     if not alerts:
@@ -262,5 +545,9 @@ def main():
     send_email(config["emails"], alerts, config["smtp_user"], config["smtp_pass"])
 
 
+def main():
+    asyncio.run(main_async())
+
+
 if __name__ == "__main__":
     main()